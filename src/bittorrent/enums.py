@@ -24,6 +24,10 @@ class PeerStatus(StrEnum):
     AM_CHOKING: str = "choking"
     AM_INTERESTED: str = "interested"
 
+class PeerTimer(StrEnum):
+    KEEP_ALIVE: str = "keep_alive"
+    INACTIVITY: str = "inactivity"
+
 class BlockStatus(StrEnum):
     MISSING: str = "missing"
     REQUESTED: str = "requested"
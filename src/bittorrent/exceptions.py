@@ -10,6 +10,12 @@ class TrackerAllTiersExhaustedError(Exception):
 class PeerError(Exception):
     pass
 
+class DuplicatePeerError(PeerError):
+    pass
+
+class MaxPeerConnectionsError(PeerError):
+    pass
+
 class UnknownMessageError(Exception):
     def __init__(self, message_id: int, payload: bytes | None = None):
         self.message_id = message_id
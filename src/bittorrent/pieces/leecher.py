@@ -29,6 +29,7 @@ logger: logging.Logger = logging.getLogger(__name__)
 
 class Leecher:
     ACCEPT_UNREQUESTED_BLOCKS: bool = True
+    PEER_MESSAGE_QUEUE_SIZE: int = 1024
     
     def __init__(
         self: Self,
@@ -39,7 +40,8 @@ class Leecher:
         max_block_requests_to_peers: int = PieceRequester.MAX_BLOCK_REQUESTS_TO_PEERS,
         max_block_requests_per_peer: int = PieceRequester.MAX_BLOCK_REQUESTS_PER_PEER,
         block_receive_timeout: int = PieceRequester.BLOCK_RECEIVE_TIMEOUT,
-        accept_unrequested_blocks: bool = ACCEPT_UNREQUESTED_BLOCKS
+        accept_unrequested_blocks: bool = ACCEPT_UNREQUESTED_BLOCKS,
+        peer_message_queue_size: int = PEER_MESSAGE_QUEUE_SIZE
         ) -> None:
         self.handshake = handshake
         self.piece_manager = piece_manager
@@ -48,7 +50,8 @@ class Leecher:
         self.accept_unrequested_blocks = accept_unrequested_blocks
         
         self._peer_queue: asyncio.Queue = asyncio.Queue()
-        self._peer_message_queue: asyncio.Queue = asyncio.Queue()
+        # Bounded, so that a backlog makes the swarm stop reading from peers instead of buffering without limit.
+        self._peer_message_queue: asyncio.Queue = asyncio.Queue(maxsize=peer_message_queue_size)
         
         self._on_peer_connected_task: asyncio.Task | None = None
         self._on_peer_message_task: asyncio.Task | None = None
@@ -144,7 +147,8 @@ class Leecher:
         if piece.all_blocks_available:
             logger.debug(f"All blocks of piece ({index}) are now available.")
             
-            if not self.piece_manager.verify_piece(index, piece_msg.piece):
+            piece_data: bytes = piece.get_blocks_data()
+            if not self.piece_manager.verify_piece(index, piece_data):
                 logger.error(f"[{peer.addr_str}] - Received piece that did not match hash: {index}:{begin}.")
                 
                 piece.clear_blocks_data()
@@ -155,7 +159,7 @@ class Leecher:
             try:
                 await self.file_handler.write_piece(
                     index=index,
-                    piece=piece.get_blocks_data()
+                    piece=piece_data
                     )
             except Exception as exc:
                 logger.error(f"Failed to write piece ({index}): {exc}.")
@@ -164,7 +168,7 @@ class Leecher:
             logger.debug(f"Downloaded piece: {index}.")
             
             piece.clear_blocks_data()
-            self.piece_manager.bitfield.set_piece(index)
+            self.piece_manager.set_piece_available(index)
             
             # Broadcast have piece.
             await self.swarm.broadcast_have_piece(index)
@@ -1,8 +1,9 @@
+import asyncio
 from bisect import insort
 from collections import Counter, deque
 import hashlib
 import math
-from typing import Generator, Self
+from typing import Generator, Iterable, Self
 
 from ..enums import BlockStatus
 from ..protocol.messages import BitFieldMessage
@@ -29,6 +30,11 @@ class PieceManager:
         self.requested_blocks: list[tuple[Piece, Block]] = list(self.get_requested_blocks())
         
         self.bitfield: BitFieldMessage = self.create_bitfield_from_pieces()
+        
+        self._available_pieces_count: int = len(self.bitfield.get_available_pieces(len(self.pieces)))
+        self._all_pieces_available_event: asyncio.Event = asyncio.Event()
+        if self._available_pieces_count == len(self.pieces):
+            self._all_pieces_available_event.set()
     
     @classmethod
     def create_pieces(
@@ -109,6 +115,19 @@ class PieceManager:
     def all_pieces_available(self: Self) -> bool:
         return all(piece.all_blocks_available for piece in self.pieces)
     
+    def set_piece_available(self: Self, index: int) -> None:
+        if self.bitfield.has_piece(index):
+            return
+        
+        self.bitfield.set_piece(index)
+        
+        self._available_pieces_count += 1
+        if self._available_pieces_count == len(self.pieces):
+            self._all_pieces_available_event.set()
+    
+    async def wait_for_all_pieces(self: Self) -> None:
+        await self._all_pieces_available_event.wait()
+    
     def has_missing_block(self: Self, piece: Piece, block: Block) -> bool:
         return (piece, block) in self.missing_blocks
     
@@ -148,7 +167,9 @@ class PieceManager:
     def verify_piece(self: Self, index: int, piece: bytes) -> bool:
         piece_hash_begin: int = index * 20
         piece_hash_end: int = piece_hash_begin + 20
-        computed_piece_hash: bytes = hashlib.sha1(piece).digest()
+        # Pass the whole piece as one contiguous buffer (bytes, bytearray or memoryview),
+        # so that it is hashed by OpenSSL in a single call.
+        computed_piece_hash: bytes = hashlib.sha1(piece, usedforsecurity=False).digest()
         return self.pieces_hash[piece_hash_begin:piece_hash_end] == computed_piece_hash
     
     def calc_pieces_availability(self: Self, bitfields: list[BitFieldMessage]) -> dict[int, int]:
@@ -172,5 +193,8 @@ class PieceManager:
         
         self.pieces_availability_counter[index] -= count
     
+    def increment_pieces_availability_count(self: Self, indexes: Iterable[int]) -> None:
+        self.pieces_availability_counter.update(indexes)
+    
     def update_pieces_availability_counter_with_bitfield(self: Self, bitfield: BitFieldMessage) -> None:
-        self.pieces_availability_counter.update({index: 1 for index in bitfield.iter_pieces(available=True)})
\ No newline at end of file
+        self.increment_pieces_availability_count(bitfield.get_available_pieces(len(self.pieces)))
\ No newline at end of file
@@ -38,13 +38,9 @@ class PieceRequester:
         self._request_blocks_task: asyncio.Task | None = None
     
     async def ensure_unchoked_peer(self: Self) -> None:
-        should_log: bool = True
-        while not self.swarm.has_unchoked_peer():
-            if should_log:
-                logger.info("No unchoked peer(s) are available currently. Waiting for unchoked peer(s)...")
-                should_log = False
-            
-            await asyncio.sleep(1)
+        if not self.swarm.has_unchoked_peer():
+            logger.info("No unchoked peer(s) are available currently. Waiting for unchoked peer(s)...")
+            await self.swarm.wait_for_unchoked_peer()
     
     async def request_blocks(self: Self) -> None:
         while not self.piece_manager.all_pieces_available:
@@ -76,7 +72,7 @@ class PieceRequester:
     
     async def request_block_from_peer(self: Self, piece: Piece, block: Block, peer: Peer) -> None:
         await peer.send_request_message(piece.index, block.begin, block.length)
-        peer.incoming_block_requests.append((piece, block))
+        peer.incoming_block_requests.add((piece, block))
         
         self.piece_manager.remove_missing_block(piece, block)
         self.piece_manager.add_requested_block(piece, block)
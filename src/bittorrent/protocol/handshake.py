@@ -17,16 +17,22 @@ class Handshake:
         self.reserved = reserved
         self.info_hash = info_hash
         self.peer_id = peer_id
+        
+        self._bytes: bytes | None = None
     
     def to_bytes(self: Self) -> bytes:
-        return struct.pack(
-            f"B{self.pstrlen}s8s20s20s",
-            self.pstrlen,
-            self.pstr,
-            self.reserved,
-            self.info_hash,
-            self.peer_id
-            )
+        # The client's handshake is sent to every peer unchanged, so it is packed once.
+        if self._bytes is None:
+            self._bytes = struct.pack(
+                f"B{self.pstrlen}s8s20s20s",
+                self.pstrlen,
+                self.pstr,
+                self.reserved,
+                self.info_hash,
+                self.peer_id
+                )
+        
+        return self._bytes
     
     @classmethod
     def from_bytes(cls: type[Self], data: bytes) -> Self:
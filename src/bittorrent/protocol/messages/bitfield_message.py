@@ -3,12 +3,21 @@ from typing import Generator, Iterable, Self
 
 from .message import Message
 
+# Piece offsets (most significant bit first) of the set bits in every byte value.
+SET_BIT_OFFSETS: tuple[tuple[int, ...], ...] = tuple(
+    tuple(bit_index for bit_index in range(8) if byte >> (7 - bit_index) & 1)
+    for byte in range(256)
+    )
+
 class BitFieldMessage(Message):
     MESSAGE_ID: int = 5
     
     SUPPORTS_PAYLOAD: bool = True
     
-    def __init__(self: Self, data: bytearray) -> None:
+    # Empty bitfields by length. The bytes are shared until a piece is set.
+    ZERO_CACHE: dict[int, bytes] = {}
+    
+    def __init__(self: Self, data: bytes | bytearray) -> None:
         self.message_length: int = self.calc_message_length() + len(data)
         self.data = data
     
@@ -23,28 +32,39 @@ class BitFieldMessage(Message):
         return cls(bytearray(payload))
     
     def has_piece(self: Self, index: int) -> bool:
-        if index < 0 or index >= len(self.data) * 8:
+        if index < 0:
             raise IndexError(f"Piece index out of range: {index}")
         
-        byte_index: int = index // 8
-        bit_index: int = index % 8
-        return self.data[byte_index] >> (7 - bit_index) & 1 != 0
+        # The byte lookup checks the upper bound.
+        try:
+            return self.data[index >> 3] >> (7 - (index & 7)) & 1 != 0
+        except IndexError:
+            raise IndexError(f"Piece index out of range: {index}") from None
     
     def set_piece(self: Self, index: int) -> None:
-        if index < 0 or index >= len(self.data) * 8:
+        if index < 0:
             raise IndexError(f"Piece index out of range: {index}")
         
-        piece_index: int = index // 8
-        bit_index: int = index % 8
-        self.data[piece_index] |= 1 << (7 - bit_index)
+        # Copy on write, the data may be shared.
+        if self.data.__class__ is bytes:
+            self.data = bytearray(self.data)
+        
+        try:
+            self.data[index >> 3] |= 1 << (7 - (index & 7))
+        except IndexError:
+            raise IndexError(f"Piece index out of range: {index}") from None
     
     def unset_piece(self: Self, index: int) -> None:
-        if index < 0 or index >= len(self.data) * 8:
+        if index < 0:
             raise IndexError(f"Piece index out of range: {index}")
         
-        piece_index: int = index // 8
-        bit_index: int = index % 8
-        self.data[piece_index] &= ~(1 << (7 - bit_index))
+        if self.data.__class__ is bytes:
+            self.data = bytearray(self.data)
+        
+        try:
+            self.data[index >> 3] &= ~(1 << (7 - (index & 7)))
+        except IndexError:
+            raise IndexError(f"Piece index out of range: {index}") from None
     
     def iter_pieces_availability(self: Self) -> Generator[tuple[int, bool], None, None]:
         for byte_index, byte in enumerate(self.data):
@@ -65,16 +85,34 @@ class BitFieldMessage(Message):
                 if is_set and available or not is_set and not available:
                     yield piece_index
     
+    def get_available_pieces(self: Self, total_pieces: int | None = None) -> list[int]:
+        pieces: list[int] = []
+        for byte_index, byte in enumerate(self.data):
+            if byte:
+                pieces.extend(map((byte_index * 8).__add__, SET_BIT_OFFSETS[byte]))
+        
+        # Drop the spare bits, if any are set.
+        if total_pieces is not None:
+            while pieces and pieces[-1] >= total_pieces:
+                pieces.pop()
+        
+        return pieces
+    
     @classmethod
     def create_bitfield(cls: type[Self], total_pieces: int, available: bool) -> Self:
         num_bytes: int = (total_pieces + 7) // 8
         
-        byte_value: int = 0xFF if available else 0x00
-        bitfield: bytearray = bytearray([byte_value] * num_bytes)
+        if not available:
+            data: bytes | None = cls.ZERO_CACHE.get(num_bytes)
+            if data is None:
+                data = cls.ZERO_CACHE[num_bytes] = bytes(num_bytes)
+            return cls(data)
+        
+        bitfield: bytearray = bytearray(b"\xff" * num_bytes)
         
         # Set the spare bits to 0.
-        if total_pieces and available:
-            spare_bits: int = 8 - (total_pieces % 8)
+        if total_pieces:
+            spare_bits: int = (8 - total_pieces % 8) % 8
             if spare_bits:
                 bitfield[-1] &= (0xFF << spare_bits)
         
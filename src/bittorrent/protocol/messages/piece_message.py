@@ -6,6 +6,8 @@ from .message import Message
 class PieceMessage(Message):
     MESSAGE_ID: int = 7
     PAYLOAD_FORMAT: str = "II"
+    PAYLOAD_STRUCT: struct.Struct = struct.Struct(f">{PAYLOAD_FORMAT}")
+    MESSAGE_STRUCT: struct.Struct = struct.Struct(f"{Message.MESSAGE_FORMAT}{PAYLOAD_FORMAT}")
     
     SUPPORTS_PAYLOAD: bool = True
     
@@ -16,15 +18,14 @@ class PieceMessage(Message):
         self.piece = piece
     
     def to_bytes(self: Self) -> bytes:
-        return struct.pack(
-            f"{self.MESSAGE_FORMAT}{self.PAYLOAD_FORMAT}",
+        return self.MESSAGE_STRUCT.pack(
             self.message_length, self.MESSAGE_ID,
             self.index, self.begin
             ) + self.piece
     
     @classmethod
     def from_bytes(cls: type[Self], payload: bytes) -> Self:
-        return cls(*struct.unpack(f">{cls.PAYLOAD_FORMAT}", payload[:8]), payload[8:])
+        return cls(*cls.PAYLOAD_STRUCT.unpack_from(payload), payload[cls.PAYLOAD_STRUCT.size:])
     
     def __repr__(self: Self) -> str:
         return (
@@ -5,22 +5,25 @@ from .message import Message
 
 class PortMessage(Message):
     MESSAGE_ID: int = 9
-    PAYLOAD_FORMAT: str = "I"
+    PAYLOAD_FORMAT: str = "H"
+    PAYLOAD_STRUCT: struct.Struct = struct.Struct(f">{PAYLOAD_FORMAT}")
+    MESSAGE_STRUCT: struct.Struct = struct.Struct(f"{Message.MESSAGE_FORMAT}{PAYLOAD_FORMAT}")
+    
+    SUPPORTS_PAYLOAD: bool = True
     
     def __init__(self: Self, listen_port: int) -> None:
         self.message_length: int = self.calc_message_length(self.PAYLOAD_FORMAT)
         self.listen_port = listen_port
     
     def to_bytes(self: Self) -> bytes:
-        return struct.pack(
-            f"{self.MESSAGE_FORMAT}{self.PAYLOAD_FORMAT}",
+        return self.MESSAGE_STRUCT.pack(
             self.message_length, self.MESSAGE_ID,
             self.listen_port
             )
     
     @classmethod
     def from_bytes(cls: type[Self], payload: bytes) -> Self:
-        return cls(struct.unpack(f">{cls.PAYLOAD_FORMAT}", payload)[0])
+        return cls(*cls.PAYLOAD_STRUCT.unpack(payload))
     
     def __repr__(self: "Port") -> str:
         return (
@@ -6,6 +6,8 @@ from .message import Message
 class RequestMessage(Message):
     MESSAGE_ID: int = 6
     PAYLOAD_FORMAT: str = "III"
+    PAYLOAD_STRUCT: struct.Struct = struct.Struct(f">{PAYLOAD_FORMAT}")
+    MESSAGE_STRUCT: struct.Struct = struct.Struct(f"{Message.MESSAGE_FORMAT}{PAYLOAD_FORMAT}")
     
     SUPPORTS_PAYLOAD: bool = True
     
@@ -16,15 +18,14 @@ class RequestMessage(Message):
         self.length = length
     
     def to_bytes(self: Self) -> bytes:
-        return struct.pack(
-            f"{self.MESSAGE_FORMAT}{self.PAYLOAD_FORMAT}",
+        return self.MESSAGE_STRUCT.pack(
             self.message_length, self.MESSAGE_ID,
             self.index, self.begin, self.length
             )
     
     @classmethod
     def from_bytes(cls: type[Self], payload: bytes) -> Self:
-        return cls(*struct.unpack(f">{cls.PAYLOAD_FORMAT}", payload))
+        return cls(*cls.PAYLOAD_STRUCT.unpack(payload))
     
     def __repr__(self: Self) -> str:
         return (
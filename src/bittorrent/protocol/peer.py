@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import struct
 from typing import Self
 
 from ..exceptions import PeerError
@@ -23,6 +24,8 @@ from .messages import (
 
 logger: logging.Logger = logging.getLogger(__name__)
 
+MESSAGE_LENGTH_STRUCT: struct.Struct = struct.Struct(">I")
+
 class Peer:
     CONNECT_TIMEOUT: int = 10
     HANDSHAKE_TIMEOUT: int = 10
@@ -31,6 +34,19 @@ class Peer:
     MAX_INCOMING_BLOCK_REQUESTS: int = 10
     MAX_OUTGOING_BLOCK_REQUESTS: int = 10
     
+    __slots__ = (
+        "host", "port", "peer_address", "addr_str",
+        "bitfield",
+        "connect_timeout", "handshake_timeout", "chunk_size",
+        "max_incoming_block_requests", "max_outgoing_block_requests",
+        "reader", "writer",
+        "last_read_time", "last_write_time",
+        "handshake",
+        "status",
+        "incoming_block_requests", "outgoing_block_requests",
+        "uploaded", "downloaded"
+        )
+    
     def __init__(
         self: Self,
         host: str,
@@ -45,6 +61,8 @@ class Peer:
         self.host = host
         self.port = port
         
+        # Built once, the swarm keys its peers by address.
+        self.peer_address: PeerAddress = PeerAddress(self.host, self.port)
         self.addr_str: str = f"{self.host}:{self.port}"
         
         self.bitfield: BitFieldMessage = bitfield
@@ -69,16 +87,12 @@ class Peer:
             PeerStatus.AM_CHOKING
         }
         
-        self.incoming_block_requests: list[tuple[Piece, Block]] = []
-        self.outgoing_block_requests: list[tuple[Piece, Block]] = []
+        self.incoming_block_requests: set[tuple[Piece, Block]] = set()
+        self.outgoing_block_requests: set[tuple[Piece, Block]] = set()
         
         self.uploaded: int = 0
         self.downloaded: int = 0
     
-    @property
-    def peer_address(self: Self) -> PeerAddress:
-        return PeerAddress(self.host, self.port)
-    
     @property
     def has_handshaken(self: Self) -> bool:
         return self.handshake is not None
@@ -176,6 +190,9 @@ class Peer:
             raise PeerError(f"Failed to connect to peer: {self.addr_str}")
         else:
             logger.info(f"[{self.addr_str}] - Connected to peer.")
+            
+            # Start the activity clock from the moment of connecting.
+            self.last_read_time = self.last_write_time = asyncio.get_running_loop().time()
     
     async def disconnect(self: Self) -> None:
         self._check_connected()
@@ -191,10 +208,13 @@ class Peer:
             self.reader, self.writer = None, None
     
     async def _send(self: Self, data: bytes) -> None:
-        self._check_connected()
+        # Inlined connection check, to keep method calls off the send path.
+        writer: asyncio.StreamWriter | None = self.writer
+        if writer is None:
+            raise RuntimeError(f"Peer is not connected: {self.addr_str}")
         
-        self.writer.write(data)
-        await self.writer.drain()
+        writer.write(data)
+        await writer.drain()
         
         self.last_write_time = asyncio.get_running_loop().time()
     
@@ -249,7 +269,7 @@ class Peer:
         elif len(data) > 4:
             raise ValueError("Length of data is greater than 4")
         
-        return int.from_bytes(data, byteorder="big")
+        return MESSAGE_LENGTH_STRUCT.unpack(data)[0]
     
     @staticmethod
     def decode_message_id_from_bytes(data: bytes) -> int:
@@ -270,36 +290,31 @@ class Peer:
             logger.error(f"[{self.addr_str}] - Message length is not exactly 4 bytes.")
             raise PeerError(f"Peer [{self.addr_str}] message length is not exactly 4 bytes")
         
-        # Read message length.
-        try:
-            message_length: int = self.decode_message_length_from_bytes(length_bytes)
-        except ValueError as exc:
-            logger.error(f"[{self.addr_str}] - Unable to decode message length: {exc}.")
-            raise PeerError(f"Unable to decode message length: [{self.addr_str}] - {exc}")
+        # Decode message length; readexactly() guarantees exactly 4 bytes.
+        message_length: int = MESSAGE_LENGTH_STRUCT.unpack(length_bytes)[0]
         
         # Read message payload.
-        data: bytes = b""
-        while len(data) < message_length:
-            chunk_size: int = min(self.chunk_size, message_length - len(data))
+        buffer: bytearray = bytearray()
+        while len(buffer) < message_length:
+            chunk_size: int = min(self.chunk_size, message_length - len(buffer))
             chunk: bytes = await self.reader.read(chunk_size)
             
             if not chunk:
-                logger.error(f"[{self.addr_str}] - Peer sent incomplete message body: {len(data)} (expected: {message_length}).")
-                raise PeerError(f"Peer [{self.addr_str}] sent incomplete message body: {len(data)} (expected: {message_length})")
+                logger.error(f"[{self.addr_str}] - Peer sent incomplete message body: {len(buffer)} (expected: {message_length}).")
+                raise PeerError(f"Peer [{self.addr_str}] sent incomplete message body: {len(buffer)} (expected: {message_length})")
             
-            data += chunk
+            buffer.extend(chunk)
         
         self.last_read_time = asyncio.get_running_loop().time()
         
-        # Extract message ID and payload.
-        data_length: int = len(data)
+        # Extract message ID and payload; the payload is copied out of the buffer only once.
         message_id: int | None = None
         payload: bytes | None = None
-        if data_length > 0:
-            message_id = self.decode_message_id_from_bytes(data[:1])
+        if message_length > 0:
+            message_id = buffer[0]
             
-            if data_length > 1:
-                payload = data[1:]
+            if message_length > 1:
+                payload = bytes(memoryview(buffer)[1:])
         
         return parse_message(message_length, message_id, payload)
     
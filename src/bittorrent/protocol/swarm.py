@@ -1,8 +1,12 @@
 import asyncio
+import heapq
+import itertools
 import logging
-from typing import Generator, Self
+from typing import Callable, Generator, Self
 
-from ..exceptions import PeerError
+from ..exceptions import PeerError, DuplicatePeerError, MaxPeerConnectionsError
+from ..enums import PeerTimer
+from ..utils import create_eager_task
 from ..pieces.piece import Piece
 from ..pieces.block import Block
 from ..pieces.piece_manager import PieceManager
@@ -24,6 +28,8 @@ class Swarm:
     KEEP_ALIVE_INTERVAL: int = 60
     INACTIVITY_TIMEOUT: int = 120
     SEND_ALREADY_HAVE_PIECE: bool = True
+    MESSAGE_BATCH_SIZE: int = 32
+    MAX_CONCURRENT_DIALS: int = 16
     
     def __init__(
         self: Self,
@@ -35,7 +41,8 @@ class Swarm:
         max_connections: int = MAX_CONNECTIONS,
         keep_alive_interval: int | None = KEEP_ALIVE_INTERVAL,
         inactivity_timeout: int | None = INACTIVITY_TIMEOUT,
-        send_already_have_piece: bool = SEND_ALREADY_HAVE_PIECE
+        send_already_have_piece: bool = SEND_ALREADY_HAVE_PIECE,
+        max_concurrent_dials: int = MAX_CONCURRENT_DIALS
         ) -> None:
         self.bitfield = bitfield
         self.piece_manager = piece_manager
@@ -43,132 +50,237 @@ class Swarm:
         self.handshake_timeout = handshake_timeout
         self.chunk_size = chunk_size
         
+        self._expected_bitfield_length: int = (len(self.piece_manager.pieces) + 7) >> 3
+        
         self.max_connections = max_connections
+        self.max_concurrent_dials = max_concurrent_dials
         self.keep_alive_interval = keep_alive_interval
         self.inactivity_timeout = inactivity_timeout
         
         self.send_already_have_piece = send_already_have_piece
         
-        self.peers: list[Peer] = []
+        self.peers: dict[PeerAddress, Peer] = {}
+        self._dialing_peer_addresses: set[PeerAddress] = set()
+        # Dials holding a semaphore slot, counted towards max_connections.
+        self._connecting_peer_count: int = 0
+        self._dial_semaphore: asyncio.BoundedSemaphore = asyncio.BoundedSemaphore(self.max_concurrent_dials)
+        self._unchoked_peers: set[Peer] = set()
+        # Set for as long as there is at least one unchoked peer.
+        self._unchoked_peer_event: asyncio.Event = asyncio.Event()
         
         self._peer_queues: list[asyncio.Queue] = []
         self._peer_message_queues: list[asyncio.Queue] = []
         
         self._peer_message_reading_tasks: dict[Peer, asyncio.Task] = {}
-        self._peer_keep_alive_timeout_tasks: dict[Peer, asyncio.Task] = {}
-        self._peer_keep_alive_interval_tasks: dict[Peer, asyncio.Task] = {}
+        
+        self._message_handlers: dict[type[Message], Callable[[Peer, Message], None]] = {
+            KeepAliveMessage: self.handle_keep_alive_message,
+            ChokeMessage: self.handle_choke_message,
+            UnchokeMessage: self.handle_unchoke_message,
+            InterestedMessage: self.handle_interested_message,
+            NotInterestedMessage: self.handle_not_interested_message,
+            HaveMessage: self.handle_have_message,
+            BitFieldMessage: self.handle_bitfield_message
+        }
+        
+        # Keep-alive and inactivity deadlines of all peers, served by a single timer handle.
+        # Entries are removed lazily: only the entry whose ID is in _peer_timer_ids is live.
+        self._peer_timers: list[tuple[float, int, Peer, PeerTimer]] = []
+        self._peer_timer_ids: dict[tuple[Peer, PeerTimer], int] = {}
+        self._peer_timer_counter: itertools.count = itertools.count()
+        self._peer_timer_handle: asyncio.TimerHandle | None = None
+        self._peer_timer_tasks: set[asyncio.Task] = set()
+    
+    @staticmethod
+    def drain_queue(queue: asyncio.Queue) -> None:
+        # Every get also wakes one put blocked on the queue.
+        while True:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+    
+    async def put_to_queues(self: Self, queues: list[asyncio.Queue], item: object) -> None:
+        # Unbounded queues never block, so only full bounded queues are awaited.
+        # Iterate over a copy, as queues may be removed while a put is blocked.
+        for queue in tuple(queues):
+            try:
+                queue.put_nowait(item)
+            except asyncio.QueueFull:
+                # A removed queue has no consumer anymore.
+                if queue not in queues:
+                    continue
+                
+                await queue.put(item)
+                
+                # The queue was removed while this put was blocked; pass the wakeup on to the other blocked puts.
+                if queue not in queues:
+                    self.drain_queue(queue)
     
     async def broadcast_peer(self: Self, peer: Peer) -> None:
-        await asyncio.gather(*(queue.put(peer) for queue in self._peer_queues))
+        await self.put_to_queues(self._peer_queues, peer)
     
     async def broadcast_peer_message(self: Self, peer: Peer, message: Message) -> None:
-        await asyncio.gather(*(queue.put((peer, message)) for queue in self._peer_message_queues))
+        await self.put_to_queues(self._peer_message_queues, (peer, message))
     
     async def broadcast_peer_messages(self: Self, peer: Peer) -> None:
+        batch_size: int = 0
         while peer.is_connected:
             try:
                 message: Message = await peer.read_message()
             except PeerError as exc:
-                logger.error(f"[{peer.addr_str}] - Failed to read peer message: {exc}.")
+                logger.error("[%s] - Failed to read peer message: %s.", peer.addr_str, exc)
                 await self.remove_peer(peer)
                 break
             
             self.handle_messages(peer, message)
             
             await self.broadcast_peer_message(peer, message)
+            
+            # Messages already buffered by the reader are drained without suspending,
+            # so yield to the event loop periodically to not starve other peers.
+            batch_size += 1
+            if batch_size >= self.MESSAGE_BATCH_SIZE:
+                batch_size = 0
+                await asyncio.sleep(0)
     
     def handle_messages(self: Self, peer: Peer, message: Message) -> None:
-        match message:
-            case KeepAliveMessage():
-                self.handle_keep_alive_message(peer)
-            case ChokeMessage():
-                self.handle_choke_message(peer)
-            case UnchokeMessage():
-                self.handle_unchoke_message(peer)
-            case InterestedMessage():
-                self.handle_interested_message(peer)
-            case NotInterestedMessage():
-                self.handle_not_interested_message(peer)
-            case HaveMessage():
-                self.handle_have_message(peer, message)
-            case BitFieldMessage():
-                self.handle_bitfield_message(peer, message)
-            case _:
-                pass
-    
-    def handle_keep_alive_message(self: Self, peer: Peer) -> None:
-        logger.debug(f"[{peer.addr_str}] - Received Keep-Alive message.")
-    
-    def handle_choke_message(self: Self, peer: Peer) -> None:
-        logger.debug(f"[{peer.addr_str}] - Received choke message.")
+        handler: Callable[[Peer, Message], None] | None = self._message_handlers.get(type(message))
+        if handler is not None:
+            handler(peer, message)
+    
+    def handle_keep_alive_message(self: Self, peer: Peer, keep_alive_msg: KeepAliveMessage) -> None:
+        logger.debug("[%s] - Received Keep-Alive message.", peer.addr_str)
+    
+    def handle_choke_message(self: Self, peer: Peer, choke_msg: ChokeMessage) -> None:
+        logger.debug("[%s] - Received choke message.", peer.addr_str)
         
         peer.is_choking = True
+        self.discard_unchoked_peer(peer)
     
-    def handle_unchoke_message(self: Self, peer: Peer) -> None:
-        logger.debug(f"[{peer.addr_str}] - Received unchoke message.")
+    def handle_unchoke_message(self: Self, peer: Peer, unchoke_msg: UnchokeMessage) -> None:
+        logger.debug("[%s] - Received unchoke message.", peer.addr_str)
         
         peer.is_choking = False
+        self.add_unchoked_peer(peer)
     
-    def handle_interested_message(self: Self, peer: Peer) -> None:
-        logger.debug(f"[{peer.addr_str}] - Received interested message.")
+    def handle_interested_message(self: Self, peer: Peer, interested_msg: InterestedMessage) -> None:
+        logger.debug("[%s] - Received interested message.", peer.addr_str)
         
         peer.is_interested = True
     
-    def handle_not_interested_message(self: Self, peer: Peer) -> None:
-        logger.debug(f"[{peer.addr_str}] - Received not interested message.")
+    def handle_not_interested_message(self: Self, peer: Peer, not_interested_msg: NotInterestedMessage) -> None:
+        logger.debug("[%s] - Received not interested message.", peer.addr_str)
         
         peer.is_interested = False
     
     def handle_have_message(self: Self, peer: Peer, have_msg: HaveMessage) -> None:
-        logger.debug(f"[{peer.addr_str}] - Received have message: {have_msg.index}.")
+        logger.debug("[%s] - Received have message: %s.", peer.addr_str, have_msg.index)
         
         try:
             peer.bitfield.set_piece(have_msg.index)
         except IndexError:
-            logger.debug(f"[{peer.addr_str}] - Received have message with invalid piece index: {have_msg.index}.")
+            logger.debug("[%s] - Received have message with invalid piece index: %s.", peer.addr_str, have_msg.index)
         
         self.piece_manager.increment_piece_availability_count(have_msg.index)
     
     def handle_bitfield_message(self: Self, peer: Peer, bitfield_msg: BitFieldMessage) -> None:
-        logger.debug(f"[{peer.addr_str}] - Received bitfield message.")
+        logger.debug("[%s] - Received bitfield message.", peer.addr_str)
         
         bitfield_length: int = len(bitfield_msg.data)
-        expected_length: int = (len(self.piece_manager.pieces) + 7) // 8
+        expected_length: int = self._expected_bitfield_length
         if bitfield_length != expected_length:
-            logger.error(f"[{peer.addr_str}] - Received bitfield message with invalid length: {bitfield_length} (expected: {expected_length}).")
+            logger.error("[%s] - Received bitfield message with invalid length: %s (expected: %s).", peer.addr_str, bitfield_length, expected_length)
             return
         
         peer.bitfield = bitfield_msg
         self.piece_manager.update_pieces_availability_counter_with_bitfield(bitfield_msg)
     
-    async def send_keep_alive_periodically(self: Self, peer: Peer) -> None:
-        while peer.is_connected:
-            elapsed_time: float = asyncio.get_running_loop().time() - peer.last_write_time
-            remaining_time: float = self.keep_alive_interval - elapsed_time
+    async def send_keep_alive(self: Self, peer: Peer) -> None:
+        try:
+            await peer.send_keep_alive_message()
+        except PeerError:
+            # Also when the peer is already gone, so that its timer id is not left behind.
+            self.cancel_peer_timer(peer, PeerTimer.KEEP_ALIVE)
+            if self.has_peer(peer):
+                await self.remove_peer(peer)
+            return
+        
+        logger.debug("[%s] - Sent a Keep-Alive message to the peer.", peer.addr_str)
+        
+        if (peer, PeerTimer.KEEP_ALIVE) in self._peer_timer_ids:
+            self.schedule_peer_timer(peer, PeerTimer.KEEP_ALIVE, peer.last_write_time + self.keep_alive_interval)
+    
+    async def remove_inactive_peer(self: Self, peer: Peer) -> None:
+        logger.debug("[%s] - Peer inactivity timeout. Disconnecting peer.", peer.addr_str)
+        
+        if self.has_peer(peer):
+            await self.remove_peer(peer)
+    
+    def push_peer_timer(self: Self, peer: Peer, timer: PeerTimer, deadline: float) -> None:
+        timer_id: int = next(self._peer_timer_counter)
+        self._peer_timer_ids[(peer, timer)] = timer_id
+        heapq.heappush(self._peer_timers, (deadline, timer_id, peer, timer))
+    
+    def schedule_peer_timer(self: Self, peer: Peer, timer: PeerTimer, deadline: float) -> None:
+        self.push_peer_timer(peer, timer, deadline)
+        
+        if self._peer_timer_handle is None or deadline < self._peer_timer_handle.when():
+            self.arm_peer_timer()
+    
+    def cancel_peer_timer(self: Self, peer: Peer, timer: PeerTimer) -> bool:
+        return self._peer_timer_ids.pop((peer, timer), None) is not None
+    
+    def arm_peer_timer(self: Self) -> None:
+        if self._peer_timer_handle is not None:
+            self._peer_timer_handle.cancel()
+            self._peer_timer_handle = None
+        
+        # Drop cancelled entries from the top of the heap.
+        while self._peer_timers:
+            _, timer_id, peer, timer = self._peer_timers[0]
+            if self._peer_timer_ids.get((peer, timer)) == timer_id:
+                break
             
-            if remaining_time <= 0.0:
-                try:
-                    await peer.send_keep_alive_message()
-                except PeerError:
-                    await self.remove_peer(peer)
-                    break
-                else:
-                    logger.debug(f"[{peer.addr_str}] - Sent a Keep-Alive message to the peer.")
-                    await asyncio.sleep(self.keep_alive_interval)
-            else:
-                await asyncio.sleep(remaining_time)
+            heapq.heappop(self._peer_timers)
+        
+        if self._peer_timers:
+            self._peer_timer_handle = asyncio.get_running_loop().call_at(self._peer_timers[0][0], self.on_peer_timer)
     
-    async def monitor_inactivity(self: Self, peer: Peer) -> None:
-        while peer.is_connected:
-            inactivity_duration: float = asyncio.get_running_loop().time() - peer.last_read_time
-            remaining_time: float = self.inactivity_timeout - inactivity_duration
+    def on_peer_timer(self: Self) -> None:
+        self._peer_timer_handle = None
+        
+        now: float = asyncio.get_running_loop().time()
+        while self._peer_timers and self._peer_timers[0][0] <= now:
+            _, timer_id, peer, timer = heapq.heappop(self._peer_timers)
+            if self._peer_timer_ids.get((peer, timer)) != timer_id:
+                continue
             
-            if remaining_time <= 0.0:
-                logger.debug(f"[{peer.addr_str}] - Peer inactivity timeout. Disconnecting peer.")
-                await self.remove_peer(peer)
-                break
+            # Peer activity only moves deadlines forward, so they are re-checked on expiry
+            # instead of rescheduling on every read and write.
+            deadline: float
+            match timer:
+                case PeerTimer.KEEP_ALIVE:
+                    deadline = peer.last_write_time + self.keep_alive_interval
+                    if deadline > now:
+                        self.push_peer_timer(peer, timer, deadline)
+                        continue
+                    
+                    coro = self.send_keep_alive(peer)
+                case PeerTimer.INACTIVITY:
+                    deadline = peer.last_read_time + self.inactivity_timeout
+                    if deadline > now:
+                        self.push_peer_timer(peer, timer, deadline)
+                        continue
+                    
+                    self.cancel_peer_timer(peer, timer)
+                    coro = self.remove_inactive_peer(peer)
             
-            await asyncio.sleep(remaining_time)
+            task: asyncio.Task = asyncio.create_task(coro)
+            self._peer_timer_tasks.add(task)
+            task.add_done_callback(self._peer_timer_tasks.discard)
+        
+        self.arm_peer_timer()
     
     def add_peer_queue(self: Self, queue: asyncio.Queue) -> None:
         if queue in self._peer_queues:
@@ -183,7 +295,7 @@ class Swarm:
             raise ValueError("Queue does not exists")
     
     def add_peer_message_queue(self: Self, queue: asyncio.Queue) -> None:
-        if queue in self._peer_queues:
+        if queue in self._peer_message_queues:
             raise ValueError("Queue already exists")
         
         self._peer_message_queues.append(queue)
@@ -193,6 +305,9 @@ class Swarm:
             self._peer_message_queues.remove(queue)
         except ValueError:
             raise ValueError("Queue does not exists")
+        
+        # Release the peers whose message reading is blocked on the queue being full.
+        self.drain_queue(queue)
     
     def start_peer_message_reading(self: Self, peer: Peer) -> None:
         if peer in self._peer_message_reading_tasks:
@@ -201,92 +316,109 @@ class Swarm:
         self._peer_message_reading_tasks[peer] = asyncio.create_task(self.broadcast_peer_messages(peer))
     
     async def stop_peer_message_reading(self: Self, peer: Peer) -> None:
-        if peer not in self._peer_message_reading_tasks:
+        task: asyncio.Task | None = self._peer_message_reading_tasks.pop(peer, None)
+        if task is None:
             raise KeyError("Peer message reading was not started")
         
-        task = self._peer_message_reading_tasks[peer]
-        task.cancel()
+        await self.cancel_peer_task(task)
+    
+    @staticmethod
+    async def cancel_peer_task(task: asyncio.Task) -> None:
+        # The reading task stops on its own when it is the one removing the peer.
+        if task is asyncio.current_task():
+            return
         
-        try:
-            await task
-        except asyncio.CancelledError:
-            pass
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
     
     def enable_peer_inactivity_timeout(self: Self, peer: Peer) -> None:
         if self.inactivity_timeout is None:
             raise ValueError("inactivity_timeout is None.")
-        if peer in self._peer_keep_alive_timeout_tasks:
+        if (peer, PeerTimer.INACTIVITY) in self._peer_timer_ids:
             raise ValueError("Peer already has a keep-alive timeout.")
         
-        self._peer_keep_alive_timeout_tasks[peer] = asyncio.create_task(
-            self.monitor_inactivity(peer)
-        )
+        self.schedule_peer_timer(peer, PeerTimer.INACTIVITY, peer.last_read_time + self.inactivity_timeout)
     
-    async def disable_peer_inactivity_timeout(self: Self, peer: Peer) -> None:
-        task = self._peer_keep_alive_timeout_tasks.pop(peer, None)
-        if task is None:
+    def disable_peer_inactivity_timeout(self: Self, peer: Peer) -> None:
+        if not self.cancel_peer_timer(peer, PeerTimer.INACTIVITY):
             raise ValueError("Peer inactivity timeout not enabled.")
-        
-        task.cancel()
-        try:
-            await task
-        except asyncio.CancelledError:
-            pass
     
     def enable_peer_keep_alive_interval(self: Self, peer: Peer) -> None:
         if self.keep_alive_interval is None:
             raise ValueError("keep_alive_interval is None.")
-        if peer in self._peer_keep_alive_interval_tasks:
+        if (peer, PeerTimer.KEEP_ALIVE) in self._peer_timer_ids:
             raise ValueError("Peer already has a keep-alive interval.")
         
-        self._peer_keep_alive_interval_tasks[peer] = asyncio.create_task(
-            self.send_keep_alive_periodically(peer)
-        )
+        self.schedule_peer_timer(peer, PeerTimer.KEEP_ALIVE, peer.last_write_time + self.keep_alive_interval)
     
-    async def disable_peer_keep_alive_interval(self: Self, peer: Peer) -> None:
-        task = self._peer_keep_alive_interval_tasks.pop(peer, None)
-        if task is None:
+    def disable_peer_keep_alive_interval(self: Self, peer: Peer) -> None:
+        if not self.cancel_peer_timer(peer, PeerTimer.KEEP_ALIVE):
             raise ValueError("Peer keep-alive interval not enabled.")
+    
+    def has_peer_address(self: Self, peer_addr: PeerAddress) -> bool:
+        return peer_addr in self.peers or peer_addr in self._dialing_peer_addresses
+    
+    async def connect_peer(self: Self, peer_addr: PeerAddress) -> Peer:
+        if self.has_peer_address(peer_addr):
+            raise DuplicatePeerError(f"Peer is already connected or being connected: {peer_addr.host}:{peer_addr.port}")
         
-        task.cancel()
+        self._dialing_peer_addresses.add(peer_addr)
         try:
-            await task
-        except asyncio.CancelledError:
-            pass
+            return await self._connect_peer(peer_addr)
+        finally:
+            self._dialing_peer_addresses.discard(peer_addr)
+    
+    async def _connect_peer(self: Self, peer_addr: PeerAddress) -> Peer:
+        # Bounds the number of connection attempts in flight; the limit is checked
+        # only once a slot is free, so it accounts for the dials that finished meanwhile.
+        async with self._dial_semaphore:
+            if len(self.peers) + self._connecting_peer_count >= self.max_connections:
+                raise MaxPeerConnectionsError(f"Max peer connections exceeded ({self.max_connections})")
+            
+            self._connecting_peer_count += 1
+            try:
+                peer: Peer = Peer(
+                    host=peer_addr.host,
+                    port=peer_addr.port,
+                    # Each peer needs its own bitfield; bytes data is shared copy-on-write.
+                    bitfield=BitFieldMessage(bytes(self.bitfield.data)),
+                    connect_timeout=self.connect_timeout,
+                    handshake_timeout=self.handshake_timeout,
+                    chunk_size=self.chunk_size
+                    )
+                await peer.connect()
+            finally:
+                self._connecting_peer_count -= 1
+            
+            return peer
     
-    async def connect_peer(self: Self, peer_addr: PeerAddress) -> Peer:
-        if len(self.peers) >= self.max_connections:
-            raise RuntimeError(f"Max peer connections exceeded ({self.max_connections})")
-        
-        peer: Peer = Peer(
-            host=peer_addr.host,
-            port=peer_addr.port,
-            bitfield=self.bitfield,
-            connect_timeout=self.connect_timeout,
-            handshake_timeout=self.handshake_timeout,
-            chunk_size=self.chunk_size
-            )
-        await peer.connect()
+    async def stop_peer_tasks(self: Self, peer: Peer) -> None:
+        # Keep-alive and inactivity are heap timers, so the reading task is the only one to await.
+        self.cancel_peer_timer(peer, PeerTimer.INACTIVITY)
+        self.cancel_peer_timer(peer, PeerTimer.KEEP_ALIVE)
         
-        return peer
+        task: asyncio.Task | None = self._peer_message_reading_tasks.pop(peer, None)
+        if task is not None:
+            await self.cancel_peer_task(task)
     
     async def disconnect_peer(self: Self, peer: Peer) -> None:
-        if peer in self._peer_message_reading_tasks:
-            await self.stop_peer_message_reading(peer)
-        if peer in self._peer_keep_alive_timeout_tasks:
-            await self.disable_peer_inactivity_timeout(peer)
-        if peer in self._peer_keep_alive_interval_tasks:
-            await self.disable_peer_keep_alive_interval(peer)
-        
+        if self.has_peer(peer):
+            del self.peers[peer.peer_address]
+        self.discard_unchoked_peer(peer)
+        await self.stop_peer_tasks(peer)
         await peer.disconnect()
     
     async def disconnect_peers(self: Self) -> list[Peer | PeerError]:
-        return await asyncio.gather(*(self.disconnect_peer(peer) for peer in self.peers), return_exceptions=True)
+        return await asyncio.gather(*(self.disconnect_peer(peer) for peer in self.peers.values()), return_exceptions=True)
+    
+    def has_peer(self: Self, peer: Peer) -> bool:
+        return self.peers.get(peer.peer_address) is peer
     
     async def add_peer(self: Self, peer_addr: PeerAddress) -> Peer:
         peer: Peer = await self.connect_peer(peer_addr)
         
-        self.peers.append(peer)
+        self.peers[peer.peer_address] = peer
+        
         await self.broadcast_peer(peer)
         
         return peer
@@ -300,18 +432,19 @@ class Swarm:
             else:
                 return peer
         
-        return await asyncio.gather(*(add_peer(peer_addr) for peer_addr in peer_addresses))
+        return await asyncio.gather(*(create_eager_task(add_peer(peer_addr)) for peer_addr in peer_addresses))
     
     async def remove_peer(self: Self, peer: Peer) -> None:
-        if peer not in self.peers:
+        if not self.has_peer(peer):
             raise KeyError(f"Peer does not exists: {peer}")
         
         try:
             await self.disconnect_peer(peer)
         except Exception as exc:
-            logger.debug(f"[{peer.addr_str}] - Failed to disconnect from peer: {exc}.")
+            logger.debug("[%s] - Failed to disconnect from peer: %s.", peer.addr_str, exc)
         finally:
-            self.peers.remove(peer)
+            self.peers.pop(peer.peer_address, None)
+            self.discard_unchoked_peer(peer)
     
     async def remove_peers(self: Self, peers: list[Peer]) -> list[Peer | tuple[Peer, PeerError]]:
         async def remove_peer(peer: Peer) -> Peer | tuple[Peer, PeerError]:
@@ -324,8 +457,23 @@ class Swarm:
         
         return await asyncio.gather(*(remove_peer(peer) for peer in peers))
     
+    def add_unchoked_peer(self: Self, peer: Peer) -> None:
+        self._unchoked_peers.add(peer)
+        self._unchoked_peer_event.set()
+    
+    def discard_unchoked_peer(self: Self, peer: Peer) -> None:
+        self._unchoked_peers.discard(peer)
+        if not self._unchoked_peers:
+            self._unchoked_peer_event.clear()
+    
     def has_unchoked_peer(self: Self) -> bool:
-        return any(not peer.is_choking for peer in self.peers)
+        return bool(self._unchoked_peers)
+    
+    async def wait_for_unchoked_peer(self: Self) -> None:
+        await self._unchoked_peer_event.wait()
+    
+    def get_unchoked_peers(self: Self) -> list[Peer]:
+        return list(self._unchoked_peers)
     
     def get_peers(
         self: Self,
@@ -341,7 +489,8 @@ class Swarm:
         missing_pieces: int | tuple[int] | None = None,
         limit: int = 200
         ) -> Generator[Peer, None, None]:
-        for peer in self.peers:
+        # Only walk the unchoked peers when those are the only ones wanted.
+        for peer in (self.get_unchoked_peers() if unchoked else list(self.peers.values())):
             if exclude_peers is not None:
                 peers: list[Peer] = [exclude_peers] if isinstance(exclude_peers, Peer) else exclude_peers
                 if peer in peers:
@@ -402,28 +551,43 @@ class Swarm:
             return
     
     async def broadcast_have_piece(self: Self, index: int) -> tuple[list[Peer], list[tuple[Peer, PeerError]]]:
+        peers: list[Peer] = self.get_unchoked_peers()
+        if not self.send_already_have_piece:
+            # Inlined BitFieldMessage.has_piece.
+            byte_index: int = index >> 3
+            shift: int = 7 - (index & 7)
+            peers = [peer for peer in peers if not (peer.bitfield.data[byte_index] >> shift) & 1]
+        
+        results: list[None | BaseException] = await asyncio.gather(
+            *(peer.send_have_message(index) for peer in peers),
+            return_exceptions=True
+            )
+        
         succeeded_peers: list[Peer] = []
         failed_peers: list[tuple[Peer, PeerError]] = []
-        
-        async def send(peer: Peer) -> None:
-            try:
-                await peer.send_have_message(index)
-            except PeerError as exc:
-                await self.disconnect_peer(peer)
-                failed_peers.append((peer, exc))
-            else:
+        for peer, result in zip(peers, results):
+            if result is None:
                 succeeded_peers.append(peer)
+            elif isinstance(result, PeerError):
+                failed_peers.append((peer, result))
+            else:
+                raise result
         
-        tasks: Generator[asyncio.Task, None, None] = (
-            asyncio.create_task(send(peer))
-            for peer in self.get_peers(
-                unchoked=True,
-                missing_pieces=index if not self.send_already_have_piece else None
-                )
-            )
-        await asyncio.gather(*tasks)
+        if failed_peers:
+            await asyncio.gather(*(self.disconnect_peer(peer) for peer, _ in failed_peers))
         
         return (succeeded_peers, failed_peers)
     
     async def close(self: Self) -> None:
-        await self.remove_peers(self.peers)
\ No newline at end of file
+        await self.remove_peers(list(self.peers.values()))
+        
+        if self._peer_timer_handle is not None:
+            self._peer_timer_handle.cancel()
+            self._peer_timer_handle = None
+        
+        self._peer_timers.clear()
+        self._peer_timer_ids.clear()
+        
+        for task in self._peer_timer_tasks:
+            task.cancel()
+        await asyncio.gather(*self._peer_timer_tasks, return_exceptions=True)
\ No newline at end of file
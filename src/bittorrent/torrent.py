@@ -1,10 +1,14 @@
-from datetime import datetime
-import math
+from datetime import datetime, timezone
+import asyncio
+from functools import cached_property
+from operator import itemgetter
+from pathlib import Path
 from typing import Any, Self
 
-import aiofiles
 import libbencode
 
+from .utils import generate_info_hash
+
 class Torrent:
     def __init__(self: Self, data: bytes) -> None:
         self.metadata: dict[bytes, Any] = libbencode.decode(data)
@@ -17,30 +21,35 @@ class Torrent:
         self.url_list: list[bytes] | None = self.metadata.get(b"url-list")
         
         self.created_by: str | None = self.metadata.get(b"created by")
-        self.creation_date: datetime | None = datetime.utcfromtimestamp(creation_date) if (creation_date := self.metadata.get(b"creation date")) else None
+        self.creation_date: datetime | None = datetime.fromtimestamp(creation_date, tz=timezone.utc) if (creation_date := self.metadata.get(b"creation date")) else None
         
         self.comment: bytes | None = self.metadata.get(b"comment")
         
         # Helper attributes.
         self.name: str = self.info[b"name"].decode("utf-8")
         
+        self.has_multiple_files: bool = b"files" in self.info
+        
         self.piece_length: int = self.info[b"piece length"]
-        self.total_length: int = sum(file[b"length"] for file in self.info[b"files"]) if b"files" in self.info else self.info[b"length"]
+        self.total_length: int = sum(map(itemgetter(b"length"), self.info[b"files"])) if self.has_multiple_files else self.info[b"length"]
         self.last_piece_length: int = self.total_length % self.piece_length
-        self.total_pieces: int = math.ceil(self.total_length / self.piece_length)
+        self.total_pieces: int = (self.total_length + self.piece_length - 1) // self.piece_length
         self.last_piece_index: int = self.total_pieces - 1
         
         self.is_private: bool = bool(self.info.get(b"private"))
-        
-        self.has_multiple_files: bool = b"files" in self.info
+    
+    @cached_property
+    def info_hash(self: Self) -> bytes:
+        return generate_info_hash(self.info)
     
     @classmethod
     async def from_file(cls: type[Self], path: str) -> Self:
         try:
-            async with aiofiles.open(path, mode="rb") as file:
-                return cls(await file.read())
+            data: bytes = await asyncio.to_thread(Path(path).read_bytes)
         except FileNotFoundError:
             raise FileNotFoundError(f"Torrent file not found: {path}") from None
+        
+        return cls(data)
     
     def __repr__(self: Self) -> str:
         return f"Torrent(name={self.name})"
\ No newline at end of file
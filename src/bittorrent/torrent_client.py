@@ -1,6 +1,6 @@
 import asyncio
 import logging
-from typing import Self
+from typing import Any, Coroutine, Self
 
 from .enums import (
     TrackerHTTPEvent,
@@ -9,7 +9,6 @@ from .enums import (
     )
 from .utils import (
     decode_announce_list,
-    generate_info_hash,
     generate_peer_id,
     get_free_bittorrent_port,
     decode_compact_peers
@@ -24,6 +23,7 @@ from .trackers import TrackerHTTP, TrackerUDP, MultiTrackerAnnouncer
 from .protocol.messages import BitFieldMessage
 from .protocol.handshake import Handshake
 from .protocol.peer import Peer
+from .protocol.peer_address import PeerAddress
 from .protocol.swarm import Swarm
 
 from .pieces.piece_manager import PieceManager
@@ -47,12 +47,25 @@ class TorrentClient:
         self.debug: bool | None = self.settings.get_var("debug")
         self.logger: logging.Logger | None = self.initialize_logger(self.debug)
         
-        self.info_hash = generate_info_hash(self.torrent.info)
+        self.info_hash = self.torrent.info_hash
+        
+        # Announce parameters are fixed for the client's lifetime, so the settings are read once.
+        self._common_announce_kwargs: dict[str, Any] = dict(
+            info_hash=self.info_hash,
+            peer_id=self.peer_id,
+            port=self.port,
+            compact=self.settings.get_var("compact"),
+            no_peer_id=self.settings.get_var("no_peer_id"),
+            ip=self.settings.get_var("ip"),
+            numwant=self.settings.get_var("numwant")
+            )
+        self._tracker_http_key: str | None = self.settings.get_var("tracker_http_key")
+        self._tracker_udp_key: int | None = self.settings.get_var("tracker_udp_key")
         
         self.handshake: Handshake = self.create_handshake()
         
         self.multi_tracker_announcer: MultiTrackerAnnouncer | None = None
-        self.tracker_peers_info: dict[TrackerHTTP | TrackerUDP, list[tuple[str, int]]] = {}
+        self.tracker_peers_info: dict[TrackerHTTP | TrackerUDP, set[PeerAddress]] = {}
         
         self.piece_manager: PieceManager | None = None
         self.swarm: Swarm | None = None
@@ -60,6 +73,8 @@ class TorrentClient:
         self.file_handler: FileHandler | None = None
         
         self.leecher: Leecher | None = None
+        
+        self._add_peers_tasks: set[asyncio.Task] = set()
     
     @classmethod
     async def initialize(cls: type[Self], file_path: str, settings: TorrentSettings) -> None:
@@ -94,73 +109,58 @@ class TorrentClient:
             pstr=ProtocolString.BITTORRENT_PROTOCOL_V1.value,
             reserved=bytes(8),
             info_hash=self.info_hash,
-            peer_id=self.info_hash
+            peer_id=self.peer_id
             )
     
     def initialize_multi_tracker_announcer(self: Self) -> MultiTrackerAnnouncer:
         return MultiTrackerAnnouncer(
             tiers=decode_announce_list(self.torrent.announce_list),
             desired_successful_trackers=self.settings.get_var("desired_successful_trackers"),
-            info_hash=self.info_hash,
-            peer_id=self.peer_id,
-            port=self.port,
+            **self._common_announce_kwargs,
             uploaded=0,
             downloaded=0,
             left=self.torrent.total_length,
-            compact=self.settings.get_var("compact"),
-            no_peer_id=self.settings.get_var("no_peer_id"),
-            ip=self.settings.get_var("ip"),
-            numwant=self.settings.get_var("numwant"),
-            tracker_http_key=self.settings.get_var("tracker_http_key"),
-            tracker_udp_key=self.settings.get_var("tracker_udp_key"),
+            tracker_http_key=self._tracker_http_key,
+            tracker_udp_key=self._tracker_udp_key,
             tracker_http_timeout=self.settings.get_var("tracker_http_timeout"),
             tracker_udp_timeout=self.settings.get_var("tracker_udp_timeout"),
             tracker_udp_retries=self.settings.get_var("tracker_udp_retries")
             )
     
     async def announce_stopped_event_to_trackers(self: Self) -> None:
-        tasks: list[asyncio.Task] = []
+        left: int = self.torrent.total_length
+        
+        announces: list[Coroutine] = []
+        swarm_peers: dict[PeerAddress, Peer] = self.swarm.peers
         for tracker, peers_info in self.tracker_peers_info.items():
-            peers = filter(lambda peer: (peer.host, peer.port) in peers_info, self.swarm.peers)
-            uploaded: int = sum(peer.downloaded for peer in peers)
-            downloaded: int = sum(peer.uploaded for peer in peers)
-            left: int = self.torrent.total_length
-            
             if isinstance(tracker, TrackerHTTP):
-                tasks.append(asyncio.create_task(
-                    tracker.send_announce(
-                        info_hash=self.info_hash,
-                        peer_id=self.peer_id,
-                        port=self.port,
-                        uploaded=uploaded,
-                        downloaded=downloaded,
-                        left=left,
-                        compact=self.settings.get_var("compact"),
-                        no_peer_id=self.settings.get_var("no_peer_id"),
-                        event=TrackerHTTPEvent.STOPPED.value,
-                        ip=self.settings.get_var("ip"),
-                        numwant=self.settings.get_var("numwant"),
-                        key=self.settings.get_var("tracker_http_key")
-                        )
-                    ))
+                event: str | int = TrackerHTTPEvent.STOPPED.value
+                key: str | int | None = self._tracker_http_key
             elif isinstance(tracker, TrackerUDP):
-                tasks.append(asyncio.create_task(
-                    tracker.send_announce(
-                        info_hash=self.info_hash,
-                        peer_id=self.peer_id,
-                        port=self.port,
-                        uploaded=uploaded,
-                        downloaded=downloaded,
-                        left=left,
-                        compact=self.settings.get_var("compact"),
-                        no_peer_id=self.settings.get_var("no_peer_id"),
-                        event=TrackerUDPEvent.STOPPED.value,
-                        ip=self.settings.get_var("ip"),
-                        numwant=self.settings.get_var("numwant"),
-                        key=self.settings.get_var("tracker_http_key")
-                        )
-                    ))
-        await asyncio.gather(*tasks, return_exceptions=True)
+                event = TrackerUDPEvent.STOPPED.value
+                key = self._tracker_udp_key
+            else:
+                continue
+            
+            uploaded: int = 0
+            downloaded: int = 0
+            for peer_addr in peers_info:
+                peer: Peer | None = swarm_peers.get(peer_addr)
+                if peer is not None:
+                    uploaded += peer.downloaded
+                    downloaded += peer.uploaded
+            
+            announces.append(tracker.send_announce(
+                **self._common_announce_kwargs,
+                uploaded=uploaded,
+                downloaded=downloaded,
+                left=left,
+                event=event,
+                key=key
+                ))
+        
+        # All trackers are announced to concurrently, a failing tracker does not stop the others.
+        await asyncio.gather(*announces, return_exceptions=True)
     
     def initialize_piece_manager(self: Self) -> PieceManager:
         return PieceManager(
@@ -187,6 +187,7 @@ class TorrentClient:
             handshake_timeout=self.settings.get_var("peer_handshake_timeout"),
             chunk_size=self.settings.get_var("chunk_size"),
             max_connections=self.settings.get_var("max_connections"),
+            max_concurrent_dials=self.settings.get_var("max_concurrent_dials"),
             keep_alive_interval=self.settings.get_var("keep_alive_interval"),
             inactivity_timeout=self.settings.get_var("inactivity_timeout")
             )
@@ -210,11 +211,8 @@ class TorrentClient:
             max_block_requests_per_peer=self.settings.get_var("max_block_requests_per_peer")
             )
     
-    async def add_peer_addresses_to_tracker(self: Self, tracker: TrackerHTTP | TrackerUDP, peers: list[Peer]) -> None:
-        if tracker not in self.tracker_peers_info:
-            self.tracker_peers_info[tracker] = []
-        
-        self.tracker_peers_info[tracker].extend(peers)
+    async def add_peer_addresses_to_tracker(self: Self, tracker: TrackerHTTP | TrackerUDP, peer_addresses: list[PeerAddress]) -> None:
+        self.tracker_peers_info.setdefault(tracker, set()).update(peer_addresses)
     
     async def start_leeching(self: Self) -> None:
         if not self.torrent.announce and not self.torrent.announce_list:
@@ -224,26 +222,57 @@ class TorrentClient:
         if not self.multi_tracker_announcer:
             self.multi_tracker_announcer = self.initialize_multi_tracker_announcer()
         
-        if not self.piece_manager:
-            self.piece_manager = self.initialize_piece_manager()
-        
-        if not self.swarm:
-            self.swarm = self.initialize_swarm()
-        
-        if not self.file_handler:
-            self.file_handler = self.initialize_file_handler()
-        
-        if not self.leecher:
-            self.leecher = self.initialize_leecher()
-            self.leecher.start()
+        # The announce does not depend on the other components, so it runs while they are initialized.
+        announce_task: asyncio.Task = asyncio.create_task(self.multi_tracker_announcer.announce_trackers())
+        try:
+            # Creating the pieces is O(total pieces), keep it off the event loop.
+            if not self.piece_manager:
+                self.piece_manager = await asyncio.to_thread(self.initialize_piece_manager)
+            
+            if not self.swarm:
+                self.swarm = self.initialize_swarm()
+            
+            if not self.file_handler:
+                self.file_handler = self.initialize_file_handler()
+            
+            if not self.leecher:
+                self.leecher = self.initialize_leecher()
+                self.leecher.start()
+        except BaseException:
+            announce_task.cancel()
+            raise
         
         trackers_responses: list[tuple[TrackerHTTP, TrackerHTTPAnnounceResponse] | tuple[TrackerUDP, TrackerUDPAnnounceResponse]]
-        trackers_responses = await self.multi_tracker_announcer.announce_trackers()
+        trackers_responses = await announce_task
+        # Trackers return overlapping peers, merge them in order without duplicates.
+        new_peer_addresses: dict[PeerAddress, None] = {}
         for tracker, response in trackers_responses:
             peer_addresses: list[PeerAddress] = decode_compact_peers(response.peers) if isinstance(response.peers, bytes) else response.peers
             
             await self.add_peer_addresses_to_tracker(tracker, peer_addresses)
-            await self.swarm.add_peers(peer_addresses)
+            
+            new_peer_addresses.update(dict.fromkeys(peer_addresses))
+        
+        # Skip the peers the swarm already has or is dialing.
+        peer_addresses = [peer_addr for peer_addr in new_peer_addresses if not self.swarm.has_peer_address(peer_addr)]
+        if not peer_addresses:
+            return
+        
+        # Dial in the background, the swarm bounds the concurrent connection attempts.
+        task: asyncio.Task = asyncio.create_task(self.swarm.add_peers(peer_addresses))
+        self._add_peers_tasks.add(task)
+        task.add_done_callback(self.on_add_peers_done)
+    
+    def on_add_peers_done(self: Self, task: asyncio.Task) -> None:
+        self._add_peers_tasks.discard(task)
+        
+        # Nothing awaits the task, so its failure (e.g. the swarm reaching max connections) is reported here.
+        if task.cancelled():
+            return
+        
+        exc: BaseException | None = task.exception()
+        if exc is not None:
+            self.logger.error(f"Failed to add peers to the swarm: {exc}.")
     
     async def stop_leeching(self: Self) -> None:
         if not self.leecher:
@@ -252,8 +281,7 @@ class TorrentClient:
         await self.leecher.stop()
     
     async def wait_until_download_complete(self: Self) -> None:
-        while not self.piece_manager.all_pieces_available:
-            await asyncio.sleep(1)
+        await self.piece_manager.wait_for_all_pieces()
     
     async def close(self: Self) -> None:
         if self.multi_tracker_announcer:
@@ -266,6 +294,10 @@ class TorrentClient:
             await self.leecher.stop()
             self.leecher = None
         
+        for task in self._add_peers_tasks:
+            task.cancel()
+        await asyncio.gather(*self._add_peers_tasks, return_exceptions=True)
+        
         if self.tracker_peers_info:
             await self.announce_stopped_event_to_trackers()
             self.tracker_peers_info.clear()
@@ -4,89 +4,110 @@ import socket
 import struct
 import secrets
 import hashlib
-import os
-import ipaddress
-from typing import Any
+from functools import lru_cache
+from typing import Any, Callable, Coroutine
 
 import libbencode
 
 from .protocol.peer_address import PeerAddress
 
+# IPv4 address and port of a peer in compact format.
+COMPACT_PEER_STRUCT: struct.Struct = struct.Struct(">4sH")
+
 def generate_transaction_id() -> int:
-    return int.from_bytes(os.urandom(4), byteorder="big")
+    return secrets.randbits(32)
 
 def generate_tracker_key(protocol: str) -> str | int:
     match protocol:
         case "http":
             return secrets.token_urlsafe(16)
         case "udp":
-            return int.from_bytes(os.urandom(4), byteorder="big")
+            return secrets.randbits(32)
         case _:
             raise ValueError(f"Unsupported protocol: {protocol}")
 
 def generate_info_hash(info: dict[bytes, Any]) -> bytes:
-    return hashlib.sha1(libbencode.encode(info)).digest()
+    return hashlib.sha1(libbencode.encode(info), usedforsecurity=False).digest()
 
 def generate_peer_id(prefix: bytes | None = None, sep: bytes = b"-") -> bytes:
     if prefix is None:
-        prefix = os.urandom(10)
+        prefix = secrets.token_bytes(10)
     
+    # At least one random byte is required, otherwise every client with this prefix gets the same peer ID.
     length: int = 20 - len(prefix) - len(sep)
-    if length < 0:
-        raise ValueError("Prefix and separator combined length exceeds the maximum allowed length (20 bytes)")
+    if length < 1:
+        raise ValueError("Prefix and separator combined length must leave at least one random byte (20 bytes maximum)")
     
-    return prefix + sep + os.urandom(length)
+    return b"".join((prefix, sep, secrets.token_bytes(length)))
 
 def decode_announce_list(announce_list: list[list[bytes]]) -> list[list[str]]:
-    return [[uri.decode("utf-8")] for urilist in announce_list for uri in urilist]
+    # Keep the tiers, trackers are tried tier by tier (BEP 12).
+    return [[uri.decode("utf-8") for uri in tier] for tier in announce_list]
+
+def _parse_http_tracker_uri(parsed_uri: ParseResult) -> str:
+    return parsed_uri.geturl()
+
+def _parse_udp_tracker_uri(parsed_uri: ParseResult) -> tuple[str, int]:
+    if parsed_uri.hostname is None:
+        raise ValueError("UDP URI does not have hostname")
+    elif parsed_uri.port is None:
+        raise ValueError("UDP URI does not have a port")
+    
+    return (parsed_uri.hostname, parsed_uri.port)
+
+TRACKER_URI_PARSERS: dict[str, Callable[[ParseResult], str | tuple[str, int]]] = {
+    "http": _parse_http_tracker_uri,
+    "https": _parse_http_tracker_uri,
+    "udp": _parse_udp_tracker_uri
+}
 
+# The same tracker URIs are parsed repeatedly over a session, so the results are cached.
+@lru_cache(maxsize=1024)
 def parse_tracker_uri(uri: str) -> tuple[str, str | tuple[str, int]]:
     parsed_uri: ParseResult = urlparse(uri)
     scheme: str = parsed_uri.scheme
     
-    if scheme.startswith("http"):
-        return (scheme, parsed_uri.geturl())
-    elif scheme.startswith("udp"):
-        if parsed_uri.hostname is None:
-            raise ValueError("UDP URI does not have hostname")
-        elif parsed_uri.port is None:
-            raise ValueError("UDP URI does not have a port")
-        
-        return (scheme, (parsed_uri.hostname, parsed_uri.port))
-    else:
+    parser: Callable[[ParseResult], str | tuple[str, int]] | None = TRACKER_URI_PARSERS.get(scheme)
+    if parser is None:
         raise ValueError(f"Unsupported tracker URI scheme: {scheme}")
+    
+    return (scheme, parser(parsed_uri))
 
 def decode_compact_peers(data: bytes) -> list[PeerAddress]:
-    return [
-        PeerAddress(
-            host=socket.inet_ntoa(data[i:i+4]),
-            port=struct.unpack(">H", data[i+4:i+6])[0]
-            )
-        for i in range(0, len(data), 6)
-        ]
+    if len(data) % COMPACT_PEER_STRUCT.size != 0:
+        raise ValueError(f"Compact peers length is not a multiple of {COMPACT_PEER_STRUCT.size}: {len(data)}")
+    
+    inet_ntoa = socket.inet_ntoa
+    return [PeerAddress(inet_ntoa(ip), port) for ip, port in COMPACT_PEER_STRUCT.iter_unpack(data)]
 
 async def get_free_bittorrent_port() -> int:
+    # Binding fails right away when the port is in use, unlike probing it with a connection.
     for port in range(6881, 6889+1):
-        try:
-            _, writer = await asyncio.open_connection(socket.gethostname(), port)
-            
-            writer.close()
-            await writer.wait_closed()
-        except OSError:
-            return port
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            try:
+                sock.bind(("", port))
+            except OSError:
+                continue
+        
+        return port
     else:
         raise RuntimeError("No free port found in the range (6881-6889)")
 
 def convert_ip_to_integer(ip_address: str) -> int:
-    ip_version: int = ipaddress.ip_address(ip_address).version
+    # Only IPv6 addresses contain a colon, so the address is parsed just once.
+    family: int = socket.AF_INET6 if ":" in ip_address else socket.AF_INET
+    try:
+        return int.from_bytes(socket.inet_pton(family, ip_address), byteorder="big")
+    except OSError:
+        raise ValueError(f"Invalid IP address: {ip_address}") from None
+
+def create_eager_task(coro: Coroutine) -> asyncio.Task:
+    # Eager tasks (Python 3.12+) run until their first suspension right away, and skip
+    # the event loop entirely when they complete synchronously.
+    if hasattr(asyncio, "eager_task_factory"):
+        return asyncio.eager_task_factory(asyncio.get_running_loop(), coro)
     
-    match ip_version:
-        case 4:
-            return struct.unpack(">I", socket.inet_aton(ip_address))[0]
-        case 6:
-            return int.from_bytes(socket.inet_pton(socket.AF_INET6, ip_address), byteorder="big")
-        case _:
-            raise ValueError(f"Unsupported IP version: {ip_version}")
+    return asyncio.create_task(coro)
 
 def create_peer_addresses(peer_addresses: list[tuple[str, int]]) -> list[PeerAddress]:
-    return [PeerAddress(host, port) for host, port in peer_addresses]
\ No newline at end of file
+    return list(map(PeerAddress._make, peer_addresses))
\ No newline at end of file